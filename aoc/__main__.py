@@ -24,9 +24,8 @@ day_group.add_argument(
 )
 day_group.add_argument(
     "--date",
-    action="store_const",
-    const=Puzzle.from_date(),
-    dest="puzzle",
+    action="store_true",
+    dest="from_date",
     help="select a puzzle by the current date (only work during the event)"
 )
 
@@ -50,6 +49,11 @@ parser.add_argument(
 if __name__ == "__main__":
     args = parser.parse_args()
 
+    # Only create the puzzle for today's date if requested, as it
+    # requires the date to fall within the event.
+    if args.from_date:
+        args.puzzle = Puzzle.from_date()
+
     if args.debug:
         log.info("setting logging level to DEBUG")
         root_logger = logging.getLogger()
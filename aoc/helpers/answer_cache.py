@@ -1,31 +1,22 @@
 from __future__ import annotations
 
+import functools
 import hashlib
-import json
 import logging
 import pathlib
 import typing
 import warnings
 
-__all__ = ["AnswerCache", "CacheValue"]
+from msgspec.json import decode as _loads, encode as _dumps
+
+__all__ = ["AnswerCache", "CacheValue", "get_answer_cache"]
 
 log = logging.getLogger(__name__)
 
 CacheValue = typing.Optional[typing.Union[str, int, dict]]
 
 
-class AnswerCacheSingleton(type):
-    _instances = {}
-
-    def __call__(cls, solution_directory: pathlib.Path) -> AnswerCache:
-        """Make sure that we only have a single AnswerCache instance for each file."""
-        if solution_directory not in cls._instances:
-            cls._instances[solution_directory] = super().__call__(solution_directory)
-
-        return cls._instances[solution_directory]
-
-
-class AnswerCache(metaclass=AnswerCacheSingleton):
+class AnswerCache:
     """A answer cache class that can be used as a context manager."""
 
     def __init__(self, solution_directory: pathlib.Path):
@@ -37,6 +28,7 @@ class AnswerCache(metaclass=AnswerCacheSingleton):
         self._data = None
         self._uncommitted_changes = False
         self._file_hash = None
+        self._file_stat = None
 
     def __repr__(self) -> str:
         """Return the official representation of a AnswerCache instance."""
@@ -48,17 +40,27 @@ class AnswerCache(metaclass=AnswerCacheSingleton):
         return self.open()
 
     def __exit__(self, *exc_information) -> None:
-        """Commit changes and close the AnswerCache."""
-        if all(arg is None for arg in exc_information):
-            self.close(commit=True)
+        """
+        Commit changes and close the AnswerCache.
+
+        If the context is left because of an exception, the changes are
+        discarded, but the cache is still closed so it can be opened again.
+        """
+        exception_raised = exc_information[0] is not None
+        if exception_raised:
+            self._uncommitted_changes = False
+
+        self.close(commit=not exception_raised)
 
     def open(self) -> AnswerCache:
         """Open the AnswerCache instance and return `self`."""
         if self._data is not None:
             raise ValueError("cache is already opened.")
 
+        # Stat the file before reading it, so a write in between is detected.
+        self._file_stat = self._stat()
         file_contents = self.cache_path.read_bytes()
-        self._data = json.loads(file_contents.decode(encoding="utf-8"))
+        self._data = _loads(file_contents)
         self._file_hash = hashlib.sha1(file_contents).hexdigest()
         return self
 
@@ -80,11 +82,12 @@ class AnswerCache(metaclass=AnswerCacheSingleton):
         if self._data is None:
             raise ValueError("I/O operation on closed cache.")
 
+        *parent_keys, final_key = map(str, keys)
         value = self._data
-        for key in keys[:-1]:
-            value = value.get(str(key), {})
+        for key in parent_keys:
+            value = value.get(key, {})
 
-        return value.get(str(keys[-1]), default)
+        return value.get(final_key, default)
 
     def set(self, *keys, value: CacheValue) -> None:
         """
@@ -95,12 +98,18 @@ class AnswerCache(metaclass=AnswerCacheSingleton):
         if self._data is None:
             raise ValueError("I/O operation on closed cache.")
 
+        *parent_keys, final_key = map(str, keys)
         current_depth = self._data
-        for key in keys[:-1]:
-            current_depth = current_depth.setdefault(str(key), {})
+        for key in parent_keys:
+            current_depth = current_depth.setdefault(key, {})
+
+        # Setting a key to the value it already has is not a change we need
+        # to commit; this is common when rerunning an unchanged solution.
+        if final_key in current_depth and current_depth[final_key] == value:
+            return
 
         # The final key is assigned to the value, not another dictionary.
-        current_depth[str(keys[-1])] = value
+        current_depth[final_key] = value
         self._uncommitted_changes = True
 
     def commit(self) -> None:
@@ -112,8 +121,26 @@ class AnswerCache(metaclass=AnswerCacheSingleton):
             log.debug(f"{self}: commit called, but no changes to commit.")
             return
 
-        if hashlib.sha1(self.cache_path.read_bytes()).hexdigest() != self._file_hash:
+        # Only hash the file contents if the file looks like it was modified.
+        if (
+            self._stat() != self._file_stat
+            and hashlib.sha1(self.cache_path.read_bytes()).hexdigest() != self._file_hash
+        ):
             warnings.warn("cache file changed on disk after opening; changes will be overwritten!")
 
-        json.dump(self._data, self.cache_path.open(mode="w", encoding="utf-8"))
+        file_contents = _dumps(self._data)
+        self.cache_path.write_bytes(file_contents)
+        self._file_stat = self._stat()
+        self._file_hash = hashlib.sha1(file_contents).hexdigest()
         self._uncommitted_changes = False
+
+    def _stat(self) -> tuple[int, int]:
+        """Return the modification time and size of the cache file."""
+        stat_result = self.cache_path.stat()
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+
+@functools.lru_cache(maxsize=None)
+def get_answer_cache(solution_directory: pathlib.Path) -> AnswerCache:
+    """Get the AnswerCache for a solution directory, making sure we only have one per file."""
+    return AnswerCache(solution_directory)
@@ -0,0 +1,43 @@
+import logging
+import typing
+
+__all__ = ["njit", "warm_up"]
+
+log = logging.getLogger(__name__)
+
+# Note: this module is not imported by `aoc.helpers` itself, as importing
+# Numba is slow. Solutions that want to use it should import it directly.
+try:
+    from numba import njit
+except ImportError:
+    log.debug("numba is not available, jit-compiled functions will run as regular Python")
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs) -> typing.Callable:
+        """
+        Return the decorated function as-is, as Numba is not available.
+
+        This fallback supports both the `@njit` and the `@njit(...)` forms.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        return lambda function: function
+else:
+    NUMBA_AVAILABLE = True
+
+
+def warm_up(function: typing.Callable, *args) -> None:
+    """
+    Compile a jit-compiled `function` for the types of `args`, or load it from Numba's cache.
+
+    Solutions call this at module level with dummy arguments of the same types
+    as the real arguments, like empty arrays. As `Puzzle.run` and `Puzzle.time`
+    import the solution before they start timing, this keeps the compilation
+    out of the measured runtimes. The flip side is that importing the solution
+    imports Numba and compiles its functions.
+
+    Without Numba, there's nothing to compile, so this does nothing.
+    """
+    if NUMBA_AVAILABLE:
+        function(*args)
@@ -9,14 +9,15 @@ import pathlib
 import re
 import time
 import timeit
+import types
 import typing
 import webbrowser
+import zoneinfo
 
-import pytz
-import requests
-from bs4 import BeautifulSoup
+from .answer_cache import CacheValue, get_answer_cache
 
-from .answer_cache import AnswerCache, CacheValue
+if typing.TYPE_CHECKING:
+    import numpy as np
 
 __all__ = ["Puzzle"]
 
@@ -28,8 +29,21 @@ PUZZLE_INPUT_URL = PUZZLE_BASE_URL + "/input"
 PUZZLE_ANSWER_URL = PUZZLE_BASE_URL + "/answer"
 SOLUTIONS_DIR = pathlib.Path(__file__).parent.parent / 'solutions'
 INPUTS_DIR = pathlib.Path(__file__).parent.parent / 'inputs'
+SESSION_COOKIE = os.environ.get("AOC_SESSION_COOKIE")
+
+# New puzzles unlock at midnight EST, which is the New York timezone in December.
+EVENT_TIMEZONE = zoneinfo.ZoneInfo("America/New_York")
+
+# Number of timing batches to run for each part; we report the fastest batch.
+TIMING_REPEATS = 5
 
 WAIT_RE = re.compile(r'You have (?:(?P<minutes>\d+)m )?(?P<seconds>\d+)s left to wait')
+RESPONSE_RE = re.compile(
+    r"(?P<correct>That's the right answer)"
+    r"|(?P<pending>You gave an answer too recently)"
+    r"|(?P<wrong>That's not the right answer)"
+    r"|(?P<wrong_level>You don't seem to be solving the right level\.)"
+)
 
 SOLUTION_TEMPLATE = '''
 import logging
@@ -66,25 +80,23 @@ class SubmissionFailed(RuntimeError):
     """Raised when submitting an answer to the website failed."""
 
 
-class InvalidSolutionDirectory(ValueError):
-    """Raised when an invalid solution directory was observed."""
-
-
 def day_should_be_available(day: int) -> bool:
     """Check if the input for this day should be available."""
-    now = datetime.datetime.now(pytz.timezone("EST"))
-    available = datetime.datetime(2020, 12, day, 0, 0, 0, tzinfo=pytz.timezone("EST"))
+    now = datetime.datetime.now(EVENT_TIMEZONE)
+    available = datetime.datetime(2020, 12, day, 0, 0, 0, tzinfo=EVENT_TIMEZONE)
     return now >= available
 
 
-def get_puzzle_input(day: int) -> str:
-    """Get the input for the given day."""
+def get_puzzle_input_path(day: int) -> pathlib.Path:
+    """
+    Get the location of the input for the given day.
+
+    If the input is not available locally yet, it will be downloaded.
+    """
     puzzle_input = INPUTS_DIR / f"day{day:0>2}.txt"
 
     if not puzzle_input.exists():
-        if not INPUTS_DIR.exists():
-            log.info(f"the inputs dir '{INPUTS_DIR}' has not been created yet, creating...")
-            INPUTS_DIR.mkdir()
+        INPUTS_DIR.mkdir(parents=True, exist_ok=True)
 
         log.info(f"downloading puzzle input for day {day}.")
         if not day_should_be_available(day):
@@ -92,28 +104,32 @@ def get_puzzle_input(day: int) -> str:
                 f"the puzzle input for day {day} is not yet available!"
             )
 
-        session = os.environ.get("AOC_SESSION_COOKIE")
-        if not session:
+        if not SESSION_COOKIE:
             raise CookieNotSet("the environment variable `AOC_SESSION_COOKIE` was not set")
 
-        response = requests.get(
+        import urllib.error
+        import urllib.request
+
+        request = urllib.request.Request(
             PUZZLE_INPUT_URL.format(day=day),
-            cookies={"session": session}
+            headers={"Cookie": f"session={SESSION_COOKIE}"},
         )
-
-        if response.status_code != 200:
+        try:
+            with urllib.request.urlopen(request) as response:
+                puzzle_text = response.read().decode("utf-8")
+        except urllib.error.HTTPError as e:
             raise DownloadFailed(
                 f"downloading the puzzle input for day {day} failed "
-                f"with status code `{response.status_code}`."
-            )
+                f"with status code `{e.code}`."
+            ) from e
 
-        puzzle_input.write_text(response.text, encoding="utf-8")
+        puzzle_input.write_text(puzzle_text, encoding="utf-8")
 
         # Now, open the browser to start our puzzle!
         webbrowser.open(PUZZLE_BASE_URL.format(day=day))
 
-    log.debug(f"reading and returning input for day {day} from '{puzzle_input}'")
-    return puzzle_input.read_text(encoding="utf-8")
+    log.debug(f"returning '{puzzle_input}' as the input for day {day}.")
+    return puzzle_input
 
 
 def get_solution_dir(day: int) -> pathlib.Path:
@@ -123,21 +139,15 @@ def get_solution_dir(day: int) -> pathlib.Path:
     If no solution directory yet exists for this day, it will be created.
     """
     day_dir = SOLUTIONS_DIR / f"day{day:0>2}"
-    day_init = day_dir / "__init__.py"
-    day_solution = day_dir / "solution.py"
-
-    if not day_dir.exists():
-        if not SOLUTIONS_DIR.exists():
-            log.info(f"the solutions dir '{SOLUTIONS_DIR}' has not been created yet, creating...")
-            SOLUTIONS_DIR.mkdir()
 
-        log.info(f"creating missing solution directory for day {day}.")
-        day_dir.mkdir()
-        day_solution.write_text(SOLUTION_TEMPLATE, encoding="utf-8")
-        day_init.write_text("from .solution import *\n", encoding="utf-8")
-
-    if not all(path.exists() for path in (day_dir, day_init, day_solution)):
-        raise InvalidSolutionDirectory(f"the solution directory '{day_dir}' for {day} is invalid.")
+    try:
+        day_dir.mkdir(parents=True)
+    except FileExistsError:
+        pass
+    else:
+        log.info(f"created missing solution directory for day {day}.")
+        (day_dir / "solution.py").write_text(SOLUTION_TEMPLATE, encoding="utf-8")
+        (day_dir / "__init__.py").write_text("from .solution import *\n", encoding="utf-8")
 
     log.debug(f"returning '{day_dir}' as the solution directory for day {day}.")
     return day_dir
@@ -148,13 +158,18 @@ class Puzzle:
 
     def __init__(self, day: str):
         self.day = int(day.removeprefix("day"))
-        self.input = get_puzzle_input(self.day)
+        self.input_path = get_puzzle_input_path(self.day)
+        self._input = None
+        self._input_bytes = None
         self._lines = None
         self._intlines = None
+        self._intarray = None
+        self._puzzle_hash = None
         self.solution_directory = get_solution_dir(self.day)
         self.solution_path = self.solution_directory / "solution.py"
         self.solution_import = f'aoc.solutions.day{self.day:0>2}'
-        self.answer_cache = AnswerCache(self.solution_directory)
+        self._solution = None
+        self.answer_cache = get_answer_cache(self.solution_directory)
         self._helper_cache = {}
 
     @classmethod
@@ -167,7 +182,7 @@ class Puzzle:
     @classmethod
     def from_date(cls) -> Puzzle:
         """Create a Puzzle instance from a solution path."""
-        today = datetime.datetime.now(pytz.timezone("EST"))
+        today = datetime.datetime.now(EVENT_TIMEZONE)
         if today.month != 12 or today.day > 25:
             raise ValueError("You can only use this classmethod during the event!")
 
@@ -186,6 +201,21 @@ class Puzzle:
         """Get an item from the helper cache."""
         self._helper_cache[key] = value
 
+    @property
+    def input(self) -> str:
+        """Get the input for this puzzle, reading it on first access."""
+        if self._input is None:
+            log.debug(f"reading input for day {self.day} from '{self.input_path}'")
+            self._input = self.input_path.read_text(encoding="utf-8")
+        return self._input
+
+    @property
+    def input_bytes(self) -> bytes:
+        """Get the input for this puzzle encoded as UTF-8 bytes."""
+        if self._input_bytes is None:
+            self._input_bytes = self.input.encode("utf-8")
+        return self._input_bytes
+
     @property
     def lines(self) -> list[str]:
         """Get a list of lines for this puzzle input."""
@@ -197,21 +227,40 @@ class Puzzle:
     def intlines(self) -> list[int]:
         """Get a list of lines converted to integers for this puzzle input."""
         if self._intlines is None:
-            self._intlines = [int(line) for line in self.input.splitlines()]
+            self._intlines = list(map(int, self.lines))
         return self._intlines
 
+    @property
+    def intarray(self) -> np.ndarray:
+        """Get a NumPy array of the integers on the lines of this puzzle input."""
+        if self._intarray is None:
+            import numpy as np
+
+            self._intarray = np.fromstring(self.input, dtype=np.int64, sep="\n")
+        return self._intarray
+
+    @property
+    def solution(self) -> types.ModuleType:
+        """Get the solution module for this puzzle, importing it on first access."""
+        if self._solution is None:
+            self._solution = importlib.import_module(self.solution_import)
+        return self._solution
+
     @property
     def puzzle_hash(self) -> str:
         """
         Return the hex digest of the combined input and solution hash.
 
         This hash can be used to determine whether we have to run the solution
-        to get the answers or can use a cached answer.
+        to get the answers or can use a cached answer. As neither the input nor
+        the solution should change while we're running, the hash is only
+        calculated once.
         """
-        hash_input = hashlib.sha1(self.input.encode("utf-8"))
-        hash_solution = hashlib.sha1(self.solution_path.read_bytes())
-        hash_puzzle = hashlib.sha1(hash_input.digest() + hash_solution.digest())
-        return hash_puzzle.hexdigest()
+        if self._puzzle_hash is None:
+            hash_puzzle = hashlib.sha1(self.input_bytes)
+            hash_puzzle.update(self.solution_path.read_bytes())
+            self._puzzle_hash = hash_puzzle.hexdigest()
+        return self._puzzle_hash
 
     def run(self, *, submit: bool = False, ignore_cache: bool = False) -> None:
         """
@@ -224,38 +273,33 @@ class Puzzle:
         puzzle_hash = self.puzzle_hash
         cache_path = ("cached_answers", puzzle_hash)
 
-        with AnswerCache(self.solution_directory) as cache:
+        # Keep the cache open for the whole run, so we only have to read,
+        # parse, and write the cache file once.
+        with self.answer_cache as cache:
             cached_answers = cache.get(*cache_path)
 
-        if ignore_cache or not cached_answers:
-            solution = importlib.import_module(self.solution_import)
+            if ignore_cache or not cached_answers:
+                solution = self.solution
 
-            # Get puzzle preparation function
-            prepare_function = getattr(solution, "prepare_puzzle", None)
+                # Get puzzle preparation function
+                prepare_function = getattr(solution, "prepare_puzzle", None)
 
-            start = timeit.default_timer()
-            if prepare_function:
-                print("Running prepare function!")
-                prepare_function(self)
-            answer_one = solution.part_one(self)
-            answer_two = solution.part_two(self)
-            run_time = timeit.default_timer() - start
+                start = timeit.default_timer()
+                if prepare_function:
+                    print("Running prepare function!")
+                    prepare_function(self)
+                answer_one = solution.part_one(self)
+                answer_two = solution.part_two(self)
+                run_time = timeit.default_timer() - start
 
-            with AnswerCache(self.solution_directory) as cache:
                 cache.set(*cache_path, "answer_one", value=answer_one)
                 cache.set(*cache_path, "answer_two", value=answer_two)
-        else:
-            log.info("no changes detected, fetching answers from cache")
-            answer_one = cached_answers.get("answer_one")
-            answer_two = cached_answers.get("answer_two")
-            run_time = 0.0
-
-        if submit:
-            part, answer = ("1", answer_one) if answer_two is None else ("2", answer_two)
-            log.info(f"Submitting `{answer}` as the answer of day {self.day} - part {part}.")
-            self.submit(part, answer)
+            else:
+                log.info("no changes detected, fetching answers from cache")
+                answer_one = cached_answers.get("answer_one")
+                answer_two = cached_answers.get("answer_two")
+                run_time = 0.0
 
-        with AnswerCache(self.solution_directory) as cache:
             answer_one_status = cache.get(
                 "cached_submissions", "1", str(answer_one), default="not submitted"
             )
@@ -263,6 +307,17 @@ class Puzzle:
                 "cached_submissions", "2", str(answer_two), default="not submitted"
             )
 
+        if submit:
+            part, answer = ("1", answer_one) if answer_two is None else ("2", answer_two)
+            log.info(f"Submitting `{answer}` as the answer of day {self.day} - part {part}.")
+            result = self.submit(part, answer)
+
+            # The submission is cached by `submit`, so use its result as the status.
+            if result is not None and part == "1":
+                answer_one_status = result
+            elif result is not None:
+                answer_two_status = result
+
         title = f"Advent of Code — Solutions for day {self.day}"
         separator = "—" * len(title)
 
@@ -278,18 +333,30 @@ class Puzzle:
             print("Running time: cached solution")
 
     def time(self) -> None:
-        """Time the solution for this puzzle."""
-        solution = importlib.import_module(self.solution_import)
+        """
+        Time the solution for this puzzle.
+
+        Each part is timed in several batches and the fastest batch is used as
+        the runtime. Noise from other processes can only ever make a batch
+        slower, so the minimum is a better estimate than the mean.
+
+        The overhead of the timing loop itself, estimated by timing a function
+        that does nothing, is subtracted from the runtimes. This matters for
+        parts that only take a couple of microseconds to run.
+        """
+        solution = self.solution
         prepare_function = getattr(solution, "prepare_puzzle", None)
 
+        _runs, overhead = self._best_runtime(lambda _puzzle: None)
+        log.debug(f"estimated timing overhead: {overhead:.9f}s per run")
+
         results = []
         for _part in (prepare_function, solution.part_one, solution.part_two):
             if _part is None:
                 results.append(None)
                 continue
-            timer = timeit.Timer("_part(self)", globals=locals())
-            result = timer.autorange()
-            results.append(result)
+            runs, run_time = self._best_runtime(_part)
+            results.append((runs, max(0.0, run_time - overhead)))
 
         title = f"Advent of Code — Runtimes for day {self.day}"
         separator = "—" * len(title)
@@ -300,18 +367,23 @@ class Puzzle:
         combined_runtime = 0
         if results[0] is not None:
             runs, run_time = results[0]
-            avg_runtime = run_time / runs
-            print(f"Data parsing: {avg_runtime:.6f}s avg in {runs} runs")
-            combined_runtime += avg_runtime
+            print(f"Data parsing: {run_time:.6f}s (best of {TIMING_REPEATS}x{runs} runs)")
+            combined_runtime += run_time
 
         for i, (runs, run_time) in enumerate(results[1:], start=1):
-            avg_runtime = run_time/runs
-            combined_runtime += avg_runtime
-            print(f"Part {i}:       {avg_runtime:.6f}s avg in {runs} runs")
+            combined_runtime += run_time
+            print(f"Part {i}:       {run_time:.6f}s (best of {TIMING_REPEATS}x{runs} runs)")
         print(separator)
-        print(f"Combined avg runtime: {combined_runtime:.6f}s")
+        print(f"Combined runtime: {combined_runtime:.6f}s")
+
+    def _best_runtime(self, function: typing.Callable[[Puzzle], typing.Any]) -> tuple[int, float]:
+        """Return the number of runs per batch and the fastest runtime per run."""
+        timer = timeit.Timer("function(self)", globals={"function": function, "self": self})
+        runs, _ = timer.autorange()
+        batch_times = timer.repeat(repeat=TIMING_REPEATS, number=runs)
+        return runs, min(batch_times) / runs
 
-    def submit(self, part: str, answer: CacheValue) -> None:
+    def submit(self, part: str, answer: CacheValue) -> typing.Optional[str]:
         """
         Submit the answer to the Advent of Code website.
 
@@ -319,12 +391,13 @@ class Puzzle:
         one. If both are `None`, no answer is submitted.
 
         To avoid duplicate submissions, the result for each unique answer is
-        cached in the solution directory.
+        cached in the solution directory. The (cached) result is returned, or
+        `None` if the submission failed.
         """
         if answer is None:
             raise ValueError("Can't submit `None` as an answer!")
 
-        with AnswerCache(self.solution_directory) as cache:
+        with self.answer_cache as cache:
             cached_result = cache.get("cached_submissions", part, answer)
 
         if cached_result:
@@ -332,66 +405,71 @@ class Puzzle:
                 f"this answer, `{answer}`, for day {self.day} part {part} was already submitted "
                 f"and came back as {cached_result!r}"
             )
-            return
+            return cached_result
 
-        session = os.environ.get("AOC_SESSION_COOKIE")
-        if not session:
+        if not SESSION_COOKIE:
             raise CookieNotSet("the environment variable `AOC_SESSION_COOKIE` was not set")
 
-        cookies = {"session": session}
+        import requests
+        from lxml import html
 
-        result = None
-        body_text = "[no response]"
-        for retry in range(1, 3):
-            log.info(f"Trying to submit answer (attempt {retry}/2)")
-            r = requests.post(
-                PUZZLE_ANSWER_URL.format(day=self.day),
-                cookies=cookies,
-                data={"level": part, "answer": answer},
-            )
-            if not r.ok:
-                raise SubmissionFailed(
-                    f"failed to submit answer `{answer}` for part {part} of day {self.day}. "
-                    f"Status code: {r.status_code}"
-                )
+        # Use a single HTTP session, so a retry can reuse the connection.
+        with requests.Session() as http_session:
+            http_session.cookies.set("session", SESSION_COOKIE)
 
-            soup = BeautifulSoup(r.text, 'html.parser')
-            body_text = soup.html.body.main.article.p.text
-
-            if body_text.startswith("That's the right answer"):
-                result = "correct"
-                break
-            elif body_text.startswith("You gave an answer too recently"):
-                result = "pending"
-                log.info("answered too fast after an incorrect answer")
-                if retry == 1:
-                    # Calculate the required waiting time and try again...
-                    d = WAIT_RE.search(body_text).groupdict(default='0')
-                    waiting_time = 60 * int(d["minutes"]) + int(d["seconds"]) + 1
-                    log.info(f"retrying in {waiting_time} seconds...")
-                    time.sleep(waiting_time)
-                else:
-                    log.info("out of retries, aborting answer submission")
-            elif body_text.startswith("That's not the right answer"):
-                result = "wrong"
-                break
-            elif body_text.startswith("You don't seem to be solving the right level."):
-                log.info(
-                    "got a response that indicates that you've either already solved the level "
-                    "or are trying to submit an answer for a part you've not unlocked yet. "
-                    "See browser."
+            result = None
+            body_text = "[no response]"
+            for retry in range(1, 3):
+                log.info(f"Trying to submit answer (attempt {retry}/2)")
+                r = http_session.post(
+                    PUZZLE_ANSWER_URL.format(day=self.day),
+                    data={"level": part, "answer": answer},
                 )
-                webbrowser.open(r.url)
-                result = "failed"
-                break
-            else:
-                result = "failed"
-                log.error(f"received an unexpected answer from the website:\n\n{body_text}")
-                break
+                if not r.ok:
+                    raise SubmissionFailed(
+                        f"failed to submit answer `{answer}` for part {part} of day {self.day}. "
+                        f"Status code: {r.status_code}"
+                    )
+
+                document = html.fromstring(r.content)
+                body_text = document.xpath("/html/body/main/article/p")[0].text_content()
+
+                match = RESPONSE_RE.match(body_text)
+                response_type = match.lastgroup if match else None
+                if response_type == "correct":
+                    result = "correct"
+                    break
+                elif response_type == "pending":
+                    result = "pending"
+                    log.info("answered too fast after an incorrect answer")
+                    if retry == 1:
+                        # Calculate the required waiting time and try again...
+                        d = WAIT_RE.search(body_text).groupdict(default='0')
+                        waiting_time = 60 * int(d["minutes"]) + int(d["seconds"]) + 1
+                        log.info(f"retrying in {waiting_time} seconds...")
+                        time.sleep(waiting_time)
+                    else:
+                        log.info("out of retries, aborting answer submission")
+                elif response_type == "wrong":
+                    result = "wrong"
+                    break
+                elif response_type == "wrong_level":
+                    log.info(
+                        "got a response that indicates that you've either already solved the level "
+                        "or are trying to submit an answer for a part you've not unlocked yet. "
+                        "See browser."
+                    )
+                    webbrowser.open(r.url)
+                    result = "failed"
+                    break
+                else:
+                    result = "failed"
+                    log.error(f"received an unexpected answer from the website:\n\n{body_text}")
+                    break
 
         if result not in ("correct", "wrong"):
             log.warning("failed to submit answer!")
-            return
+            return None
 
         print(f"Submitted `{answer}` as the answer of day {self.day}, part {part}.")
         print(f"The answer is {result}")
@@ -399,9 +477,11 @@ class Puzzle:
         if answer == "wrong":
             print(f"Response: {body_text}")
 
-        with AnswerCache(self.solution_directory) as cache:
+        with self.answer_cache as cache:
             cache.set("cached_submissions", part, str(answer), value=result)
 
         # If we've just correctly submitted part 1, we probably want to see part 2
         if part == "1" and result == "correct":
             webbrowser.open(PUZZLE_BASE_URL.format(day=self.day))
+
+        return result
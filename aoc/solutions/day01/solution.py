@@ -1,7 +1,8 @@
-import itertools
 import logging
 import typing
 
+import numpy as np
+
 from aoc.helpers import Puzzle
 
 __all__ = ["part_one", "part_two"]
@@ -12,26 +13,42 @@ def part_one(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """
     Return the solution for part one of this day.
 
-    This solution uses a set to quickly look up if the complement we need
-    to add to 2020 is present in the current list of numbers. Assuming that
-    we're dealing with a set without critical hash collisions, this brings
-    the solution down to an O(N) complexity.
+    This solution sorts the numbers in a NumPy array and checks for all
+    numbers at once if the complement we need to add to 2020 is present in
+    that same array. The sorted array is reused for part two.
     """
-    puzzle["set"] = set(puzzle.intlines)
-
-    for number_one in puzzle["set"]:
-        if (2020 - number_one) in puzzle["set"]:
-            return (2020 - number_one) * number_one
+    puzzle["numbers"] = numbers = np.sort(puzzle.intarray)
+    complements = 2020 - numbers
+    has_complement = np.isin(complements, numbers)
+    if has_complement.any():
+        index = np.argmax(has_complement)
+        return int(numbers[index] * complements[index])
 
 
 def part_two(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """
     Return the solution for part two of this day.
 
-    This approach is similar to `part_one`: It looks at all combinations of
-    numbers, at a complexity cost of O(N^2), and determines whether or not
-    the third number required to sum to 2020 is present in the set.
+    For each number, this approach calculates the complements needed for all
+    pairs with the larger numbers at once and looks them up in the sorted
+    array with a single binary search call. This is still O(N^2 log N), but
+    the inner loop runs in NumPy instead of Python. As the numbers are
+    sorted, we can stop as soon as three times the current number exceeds
+    2020.
     """
-    for number_one, number_two in itertools.combinations(puzzle["set"], 2):
-        if (2020 - number_one - number_two) in puzzle["set"]:
-            return (2020 - number_one - number_two) * number_one * number_two
+    numbers = puzzle["numbers"]
+    last = len(numbers) - 1
+
+    for i, number_one in enumerate(numbers):
+        if 3 * number_one > 2020:
+            break
+
+        # The third number should come after the second number to make sure
+        # we don't use the same number twice.
+        second_numbers = numbers[i + 1:]
+        complements = 2020 - number_one - second_numbers
+        positions = np.minimum(np.searchsorted(numbers, complements), last)
+        matches = (numbers[positions] == complements) & (positions > np.arange(i + 1, last + 1))
+        if matches.any():
+            j = np.argmax(matches)
+            return int(number_one * second_numbers[j] * complements[j])
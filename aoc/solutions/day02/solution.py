@@ -1,5 +1,4 @@
 import logging
-import re
 import typing
 
 from aoc.helpers import Puzzle
@@ -14,16 +13,20 @@ def part_one(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     Analyze the passwords for both parts and return the answer to part one.
 
     This function calculates the answers for both parts in one go, as it's
-    easy to do in a single `for`-loop. While not strictly necessary, I've
-    chosen to use a regex pattern, as it's straightforward and readable.
+    easy to do in a single `for`-loop. As each line has the fixed format
+    `low-high char: password`, I parse the lines by locating the dash and the
+    first space instead of using a regex pattern, which is a bit faster.
 
     The answer for `part_two` is cached within the Puzzle instance so
     `part_two` can simply access it and return it as the answer.
     """
     answer_one = 0
     answer_two = 0
-    for low, hi, char, pw in re.findall(r"^(\d+)-(\d+) ([a-z]): ([a-z]+)$", puzzle.input, re.M):
-        low, hi = int(low), int(hi)
+    for line in puzzle.lines:
+        dash = line.index("-")
+        space = line.index(" ", dash)
+        low, hi = int(line[:dash]), int(line[dash+1:space])
+        char, pw = line[space+1], line[space+4:]
         answer_one += low <= pw.count(char) <= hi
         answer_two += (pw[low-1] == char) ^ (pw[hi-1] == char)
 
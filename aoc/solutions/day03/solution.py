@@ -1,6 +1,8 @@
 import logging
 import typing
 
+import numpy as np
+
 from aoc.helpers import Puzzle
 
 __all__ = ["part_one", "part_two"]
@@ -20,29 +22,30 @@ def part_one(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     the form "1 down, n right" in part two, so I coded part one to make that
     trivial. While the code written wasn't exactly useless for part two, my
     guess for the goal of part two was completely wrong.
-    """
-    width = len(puzzle.lines[0])
 
-    # Create a starting dictionary for all possible 1 down, n right headings
-    # Note: I expected that I'd need them all for part two...
-    puzzle["headings"] = dict.fromkeys(range(width), 0)
+    The map is loaded into a NumPy array, so we can count the trees for all
+    headings with a few vectorized operations instead of nested loops.
+    """
+    height, width = len(puzzle.lines), len(puzzle.lines[0])
 
-    # Initialize count for part two's 2 down, 1 right heading
-    puzzle["right_one_down_two"] = 0
+    # Load the map as a 2D boolean array that's True where there's a tree.
+    raw_map = "".join(puzzle.lines).encode("ascii")
+    trees = np.frombuffer(raw_map, dtype=np.uint8).reshape(height, width) == ord("#")
 
-    # Count trees! This gives me each new row, keeping track of the
-    # number of moves we've currently done.
-    for moves, line in enumerate(puzzle.lines[1:], start=1):
-        # Check if we're colliding with a tree for all "1 down" headings
-        for heading in range(len(puzzle.lines[0])):
-            puzzle["headings"][heading] += line[moves*heading % width] == "#"
+    # Count the trees for all possible 1 down, n right headings at once. For
+    # each row we've moved down, calculate the column we've reached for each
+    # heading and sum the trees we've encountered per heading.
+    # Note: I expected that I'd need them all for part two...
+    rows = np.arange(1, height)
+    columns = (rows[:, np.newaxis] * np.arange(width)) % width
+    puzzle["headings"] = trees[rows[:, np.newaxis], columns].sum(axis=0)
 
-        # Precalculate answer for 2 down, 1 right for part two
-        if moves % 2 == 0:
-            puzzle["right_one_down_two"] += line[(moves // 2) % width] == "#"
+    # Precalculate answer for 2 down, 1 right for part two
+    rows = np.arange(2, height, 2)
+    puzzle["right_one_down_two"] = trees[rows, (rows // 2) % width].sum()
 
     # Return the result for the heading of part one
-    return puzzle["headings"][3]
+    return int(puzzle["headings"][3])
 
 
 def part_two(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
@@ -53,10 +56,5 @@ def part_two(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     so I had to go back and adjust part one slightly. The work done in part
     one was still useful albeit overkill for the problem at hand.
     """
-    # Calculate the multiplication of 1 down, 1, 3, 5, 7 right headings.
-    answer = 1
-    for heading in range(1, 8, 2):
-        answer *= puzzle["headings"][heading]
-
-    # Multiply by 2 down, 1 right for the answer
-    return answer * puzzle["right_one_down_two"]
+    # Multiply the 1 down, 1, 3, 5, 7 right headings and 2 down, 1 right.
+    return int(np.prod(puzzle["headings"][1:8:2]) * puzzle["right_one_down_two"])
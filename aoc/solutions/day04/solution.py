@@ -1,9 +1,5 @@
-from __future__ import annotations
-
-import dataclasses
-import functools
 import logging
-import string
+import re
 import typing
 
 from aoc.helpers import Puzzle
@@ -12,7 +8,13 @@ __all__ = ["part_one", "part_two"]
 log = logging.getLogger(__name__)
 
 
-HEXDIGITS = string.hexdigits.removesuffix("ABCDEF")
+# There are only 62 valid heights, 150-193 centimeters and 59-76 inches,
+# so we simply precompute all of them.
+VALID_HEIGHTS = frozenset(
+    [f"{height}cm" for height in range(150, 194)] + [f"{height}in" for height in range(59, 77)]
+)
+HAIR_COLOR_RE = re.compile(r"#[0-9a-f]{6}")
+PASSPORT_NUMBER_RE = re.compile(r"[0-9]{9}")
 
 
 def validate_year(year: str, low: str, high: str) -> bool:
@@ -31,17 +33,12 @@ def validate_height(height: str) -> bool:
 
     This validator accepts heights in the units centimeter and inch.
     """
-    if height.endswith("cm"):
-        return "150" <= height[:-2] <= "193"
-    elif height.endswith("in"):
-        return "59" <= height[:-2] <= "76"
-    else:
-        return False
+    return height in VALID_HEIGHTS
 
 
 def validate_hair_color(hair_color: str) -> bool:
     """Validate a hair color code."""
-    return hair_color.startswith("#") and all(c in HEXDIGITS for c in hair_color[1:])
+    return HAIR_COLOR_RE.fullmatch(hair_color) is not None
 
 
 def validate_eye_color(eye_color: str) -> bool:
@@ -51,67 +48,51 @@ def validate_eye_color(eye_color: str) -> bool:
 
 def validate_passport_number(passport_number: str) -> bool:
     """Validate a passport number."""
-    return len(passport_number) == 9 and all(c in string.digits for c in passport_number)
+    return PASSPORT_NUMBER_RE.fullmatch(passport_number) is not None
 
 
-VALIDATED_FIELDS = {
-    "byr": functools.partial(validate_year, low="1920", high="2002"),
-    "iyr": functools.partial(validate_year, low="2010", high="2020"),
-    "eyr": functools.partial(validate_year, low="2020", high="2030"),
-    "hgt": validate_height,
-    "hcl": validate_hair_color,
-    "ecl": validate_eye_color,
-    "pid": validate_passport_number,
-}
+# Only the fields we need to validate are captured; to cheat border control,
+# the country code (`cid`) is ignored.
+FIELD_RE = re.compile(r"(?<!\S)(byr|iyr|eyr|hgt|hcl|ecl|pid):(\S+)")
 
+Passport = typing.NewType("Passport", dict[str, str])
+
+
+def parse_passport(data: str) -> Passport:
+    """Parse the validated fields from a raw passport data string."""
+    return Passport(dict(FIELD_RE.findall(data)))
 
-@dataclasses.dataclass()
-class Passport:
-    """
-    A Passport dataclass with field validation logic.
 
-    Note: to cheat border control, the validators ignore the country code!
+def has_required_fields(passport: Passport) -> bool:
+    """Return True if this passport has all required fields."""
+    return len(passport) == 7
+
+
+def is_valid(passport: Passport) -> bool:
     """
+    Check if the fields of a complete passport meet the validation criteria.
 
-    byr: typing.Optional[str] = None
-    iyr: typing.Optional[str] = None
-    eyr: typing.Optional[str] = None
-    hgt: typing.Optional[str] = None
-    hcl: typing.Optional[str] = None
-    ecl: typing.Optional[str] = None
-    pid: typing.Optional[str] = None
-    cid: typing.Optional[str] = None
-    _has_required_fields: bool = dataclasses.field(init=False)
-    _has_valid_fields: bool = dataclasses.field(init=False)
-
-    @classmethod
-    def from_raw_data(cls, data: str) -> Passport:
-        """Create a Passport from a raw passport data string."""
-        return cls(**dict(field.split(":") for field in data.split()))
-
-    def __post_init__(self) -> None:
-        """Validate this Passport instance."""
-        self._has_required_fields = all(getattr(self, field) for field in VALIDATED_FIELDS)
-        field_validators = (v(getattr(self, field)) for field, v in VALIDATED_FIELDS.items())
-        self._has_valid_fields = self._has_required_fields and all(field_validators)
-
-    @property
-    def has_required_fields(self) -> bool:
-        """Return True is this Passport has all required fields."""
-        return self._has_required_fields
-
-    @property
-    def is_valid(self) -> bool:
-        """Check if this passport meets the validation criteria."""
-        return self._has_valid_fields
+    The checks short-circuit, so we stop validating at the first invalid
+    field. Passports with missing fields are filtered out in part one.
+    """
+    return (
+        validate_year(passport["byr"], low="1920", high="2002")
+        and validate_year(passport["iyr"], low="2010", high="2020")
+        and validate_year(passport["eyr"], low="2020", high="2030")
+        and validate_height(passport["hgt"])
+        and validate_hair_color(passport["hcl"])
+        and validate_eye_color(passport["ecl"])
+        and validate_passport_number(passport["pid"])
+    )
 
 
 def part_one(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """Return the solution for part one of this day."""
-    puzzle["passports"] = [Passport.from_raw_data(raw) for raw in puzzle.input.split("\n\n")]
-    return sum(passport.has_required_fields for passport in puzzle["passports"])
+    passports = (parse_passport(raw) for raw in puzzle.input.split("\n\n"))
+    puzzle["passports"] = [passport for passport in passports if has_required_fields(passport)]
+    return len(puzzle["passports"])
 
 
 def part_two(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """Return the solution for part two of this day."""
-    return sum(passport.is_valid for passport in puzzle["passports"])
+    return sum(is_valid(passport) for passport in puzzle["passports"])
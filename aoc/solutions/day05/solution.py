@@ -1,9 +1,8 @@
-from __future__ import annotations
-
-import dataclasses
 import logging
 import typing
 
+import numpy as np
+
 from aoc.helpers import Puzzle
 
 
@@ -11,60 +10,37 @@ __all__ = ["part_one", "part_two"]
 log = logging.getLogger(__name__)
 
 
-def bin_to_int(bin_string: str, *, zero: str = "0", one: str = "1") -> int:
-    """
-    Convert a binary string to an integer.
-
-    This function accepts optional keyword arguments to specify
-    the characters used for 0 and 1 in the string to support
-    different encodings.
-    """
-    return int(bin_string.replace(zero, "0").replace(one, "1"), base=2)
-
-
-@dataclasses.dataclass
-class BoardingPass:
-    """A dataclass to represent a boarding pass."""
+# Boarding passes use binary space partitioning, which means that we can
+# interpret them as 10-bit binary numbers: `B` and `R` are the one bits and
+# the most significant bit comes first. Multiplying the bits by these weights
+# and summing the result gives us the seat ID.
+SEAT_ID_WEIGHTS = 1 << np.arange(9, -1, -1)
 
-    min_seat_id: typing.ClassVar[float] = float('inf')
-    max_seat_id: typing.ClassVar[float] = float('-inf')
-    seat_ids: typing.ClassVar[set] = set()
-
-    row: int
-    column: int
-    seat_id: int
-
-    @classmethod
-    def from_space_partition(cls, space_partition: str) -> BoardingPass:
-        """Create a boardingpass from a space partition string."""
-        row = bin_to_int(space_partition[:7], zero="F", one="B")
-        col = bin_to_int(space_partition[7:], zero="L", one="R")
-        seat_id = row * 8 + col
-
-        # Keep track of the seat IDs we've seen.
-        cls.min_seat_id = cls.min_seat_id if cls.min_seat_id < seat_id else seat_id
-        cls.max_seat_id = cls.max_seat_id if cls.max_seat_id > seat_id else seat_id
-        cls.seat_ids.add(seat_id)
-
-        return cls(row, col, seat_id)
 
+def part_one(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
+    """
+    Return the highest seat ID of all boarding passes.
 
-def part_one(puzzle: Puzzle) -> typing.Optional[typing.Union[str, float, int]]:
-    """Return the solution for part one of this day."""
-    puzzle["boardingpasses"] = [BoardingPass.from_space_partition(entry) for entry in puzzle.lines]
-    return BoardingPass.max_seat_id
+    Instead of decoding the boarding passes one by one, this solution loads
+    all of them into a single (N, 10) array of characters and calculates all
+    seat IDs in one go.
+    """
+    boarding_passes = np.frombuffer("".join(puzzle.lines).encode("ascii"), dtype=np.uint8)
+    boarding_passes = boarding_passes.reshape(-1, 10)
+    bits = (boarding_passes == ord("B")) | (boarding_passes == ord("R"))
+    puzzle["seat_ids"] = bits @ SEAT_ID_WEIGHTS
+    return int(puzzle["seat_ids"].max())
 
 
-def part_two(_puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
+def part_two(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """
     Return the ID of my seat.
 
-    This solution uses a set-approach to avoid sorting the know seat IDs. It
-    keeps track of the minimum and the maximum while creating the set so we
-    can compare the entire range to know IDs. The only one that's missing
-    should be my seat ID.
+    The known seat IDs form a range from the minimum to the maximum ID with
+    only my seat ID missing. This means that my seat ID is the difference
+    between the sum of that complete range, which we can calculate directly
+    with the formula for an arithmetic series, and the sum of the known IDs.
     """
-    known_ids = BoardingPass.seat_ids
-    minimum = int(BoardingPass.min_seat_id)
-    maximum = int(BoardingPass.max_seat_id)
-    return int(*known_ids.symmetric_difference(range(minimum, maximum+1)))
+    seat_ids = puzzle["seat_ids"]
+    minimum, maximum = int(seat_ids.min()), int(seat_ids.max())
+    return (minimum + maximum) * (maximum - minimum + 1) // 2 - int(seat_ids.sum())
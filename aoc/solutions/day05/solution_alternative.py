@@ -1,6 +1,4 @@
-import dataclasses
 import logging
-import operator
 import typing
 
 from aoc.helpers import Puzzle
@@ -9,42 +7,36 @@ __all__ = ["part_one", "part_two"]
 log = logging.getLogger(__name__)
 
 
-def bin_to_int(bin_string: str, *, zero: str = "0", one: str = "1") -> int:
-    """
-    Convert a binary string to an integer.
+# Translation table to turn the row (F/B) and column (L/R) letters into bits.
+BINARY_TRANSLATION = str.maketrans("FBLR", "0101")
 
-    This function accepts optional keyword arguments to specify
-    the characters used for 0 and 1 in the string to support
-    different encodings.
-    """
-    return int(bin_string.replace(zero, "0").replace(one, "1"), base=2)
 
+class BoardingPass(typing.NamedTuple):
+    """A named tuple to represent a boarding pass."""
 
-@dataclasses.dataclass
-class BoardingPass:
-    """A dataclass to represent a boarding pass."""
+    row: int
+    column: int
+    seat_id: int
 
-    space_partition: str
-    row: int = dataclasses.field(init=False)
-    column: int = dataclasses.field(init=False)
-    seat_id: int = dataclasses.field(init=False)
 
-    def __post_init__(self) -> None:
-        """Calculate the row and column of each boarding pass."""
-        self.row = bin_to_int(self.space_partition[:7], zero="F", one="B")
-        self.column = bin_to_int(self.space_partition[7:], zero="L", one="R")
-        self.seat_id = self.row * 8 + self.column
+def parse_boarding_pass(space_partition: str) -> BoardingPass:
+    """Calculate the row, column, and seat ID of a boarding pass."""
+    # As `row * 8 + column` is just a left shift of the row by three bits,
+    # the whole space partition read as binary is the seat ID.
+    seat_id = int(space_partition.translate(BINARY_TRANSLATION), base=2)
+    return BoardingPass(row=seat_id >> 3, column=seat_id & 7, seat_id=seat_id)
 
 
 def part_one(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """Return the solution for part one of this day."""
-    puzzle["boardingpasses"] = [BoardingPass(entry) for entry in puzzle.lines]
+    puzzle["boardingpasses"] = [parse_boarding_pass(entry) for entry in puzzle.lines]
     return max(boardingpass.seat_id for boardingpass in puzzle["boardingpasses"])
 
 
 def part_two(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """Return the solution for part two of this day."""
-    sorted_passes = sorted(puzzle["boardingpasses"], key=operator.attrgetter('seat_id'))
-    for neighbor_one, neighbor_two in zip(sorted_passes, sorted_passes[1:]):
-        if neighbor_two.seat_id - neighbor_one.seat_id == 2:
-            return neighbor_one.seat_id + 1
+    # My seat is the only one missing from the range of known seat IDs, so
+    # it's the difference between the sum of that range and the known IDs.
+    seat_ids = [boardingpass.seat_id for boardingpass in puzzle["boardingpasses"]]
+    lowest, highest = min(seat_ids), max(seat_ids)
+    return (lowest + highest) * (highest - lowest + 1) // 2 - sum(seat_ids)
@@ -1,39 +1,66 @@
-import functools
 import logging
 import typing
 
+import numpy as np
+
 from aoc.helpers import Puzzle
 
 __all__ = ["part_one", "part_two"]
 log = logging.getLogger(__name__)
 
-CustomsGroups = typing.NewType("CustomsGroups", typing.List[typing.List[typing.Set[str]]])
+
+class CustomsGroups(typing.NamedTuple):
+    """The answers of all individuals with the index at which each group starts."""
+
+    individuals: np.ndarray
+    group_starts: np.ndarray
+
+
+def answers_to_bitmask(answers: str) -> int:
+    """
+    Convert the answers of an individual to a bitmask.
+
+    Each of the questions `a` to `z` gets its own bit in the bitmask, which
+    is set if the individual answered "yes" to that question.
+    """
+    bitmask = 0
+    for answer in answers:
+        bitmask |= 1 << (ord(answer) - ord("a"))
+    return bitmask
 
 
-def reduced_groups_count(groups: CustomsGroups, reduction_func: typing.Callable) -> int:
+def reduced_groups_count(groups: CustomsGroups, reduction_func: np.ufunc) -> int:
     """
     Return the sum of group answer frequencies reduced by a reduction function.
 
-    With `set.union`, this function returns the sum of the number of unique
+    With `np.bitwise_or`, this function returns the sum of the number of unique
     answers given per group.
 
-    With `set.intersection`, this function returns the sum of the number of
+    With `np.bitwise_and`, this function returns the sum of the number of
     answers shared by all members in a group.
+
+    The bitmasks of all groups are reduced in a single `reduceat` call, after
+    which we count the set bits of all reduced bitmasks at once.
     """
-    return sum(len(functools.reduce(reduction_func, group)) for group in groups)
+    reduced = reduction_func.reduceat(groups.individuals, groups.group_starts)
+    return int(np.unpackbits(reduced.view(np.uint8)).sum())
 
 
 def part_one(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """Return the sum of the number of unique answers given per group."""
+    individuals = []
+    group_starts = []
+    for group in puzzle.input.split("\n\n"):
+        group_starts.append(len(individuals))
+        individuals.extend(answers_to_bitmask(individual) for individual in group.splitlines())
+
     puzzle["groups"] = CustomsGroups(
-        [
-            [set(individual) for individual in group.splitlines()]
-            for group in puzzle.input.split("\n\n")
-        ]
+        individuals=np.array(individuals, dtype=np.uint32),
+        group_starts=np.array(group_starts, dtype=np.intp),
     )
-    return reduced_groups_count(puzzle["groups"], set.union)
+    return reduced_groups_count(puzzle["groups"], np.bitwise_or)
 
 
 def part_two(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """Return the sum of the number of answers shared by all in a group."""
-    return reduced_groups_count(puzzle["groups"], set.intersection)
+    return reduced_groups_count(puzzle["groups"], np.bitwise_and)
@@ -4,6 +4,7 @@ import collections
 import dataclasses
 import functools
 import logging
+import re
 import typing
 
 from aoc.helpers import Puzzle
@@ -12,19 +13,8 @@ from aoc.helpers import Puzzle
 __all__ = ["part_one", "part_two", "prepare_puzzle"]
 log = logging.getLogger(__name__)
 
-
-class BagCollection(collections.UserDict):
-    """A dict-like Bag Collection."""
-
-    def __getitem__(self, key: typing.Union[str, Bag]) -> Bag:
-        """Get a Bag from our bag collection, inserting missing bags as needed."""
-        if isinstance(key, Bag):
-            key = Bag.name
-
-        if key not in self.data:
-            self.data[key] = Bag(key)
-
-        return self.data[key]
+BAG_RE = re.compile(r"^(\w+ \w+) bags contain (.+)\.$")
+CHILD_RE = re.compile(r"(\d+) (\w+ \w+) bag")
 
 
 @dataclasses.dataclass
@@ -62,12 +52,19 @@ class Bag:
         """
         Return the set of ancestors for this bag.
 
-        As the same bag may be an ancestor to multiple bags, we cache the
-        ancestry the first time we calculate it.
+        The ancestors are found with an iterative breadth-first search over the
+        parents, which means we do not have to recurse into the ancestry of each
+        parent. The result is cached on this bag only.
         """
-        ancestors = set(self.parents)
-        for parent in self.parents:
-            ancestors.update(parent.ancestors)
+        ancestors = set()
+        queue = collections.deque(self.parents)
+        while queue:
+            parent = queue.popleft()
+            if parent in ancestors:
+                continue
+
+            ancestors.add(parent)
+            queue.extend(parent.parents)
 
         return ancestors
 
@@ -77,21 +74,25 @@ class Bag:
         child.parents.add(self)
 
 
+def get_bag(bags: typing.Dict[str, Bag], name: str) -> Bag:
+    """Get a Bag from the dictionary of bags, inserting it if it's missing."""
+    bag = bags.get(name)
+    if bag is None:
+        bag = bags[name] = Bag(name)
+
+    return bag
+
+
 def prepare_puzzle(puzzle: Puzzle) -> None:
     """Prepare the input for today's puzzle."""
-    puzzle["bags"] = BagCollection()
-    for bag in puzzle.lines:
-        bag_name, _sep, children = bag.partition(" bags contain ")
-        bag = puzzle["bags"][bag_name]
-
-        if children.startswith("no other bags"):
-            continue
-
-        for child in children.rstrip(".").split(", "):
-            quantity, _sep, child_name = child.partition(" ")
-            child_name = " ".join(child_name.split(" ")[:2])
-            child = puzzle["bags"].setdefault(child_name, Bag(child_name))
-            bag.add_child(child, int(quantity))
+    puzzle["bags"] = bags = {}
+    for line in puzzle.lines:
+        bag_name, children = BAG_RE.match(line).groups()
+        bag = get_bag(bags, bag_name)
+
+        # Bags without children ("no other bags") simply have no matches
+        for quantity, child_name in CHILD_RE.findall(children):
+            bag.add_child(get_bag(bags, child_name), int(quantity))
 
 
 def part_one(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
@@ -4,12 +4,107 @@ import collections
 import logging
 import typing
 
+import numpy as np
+
 from aoc.helpers import Puzzle
+from aoc.helpers.jit import njit, warm_up
 
 __all__ = ["part_one", "part_two", "prepare_puzzle"]
 log = logging.getLogger(__name__)
 
 
+# Integer operation codes used by the jit-compiled interpreter functions.
+ACC, JMP, NOP = 0, 1, 2
+OPERATION_CODES = {"acc": ACC, "jmp": JMP, "nop": NOP}
+
+
+@njit(cache=True)
+def execute(
+        operations: np.ndarray,
+        arguments: np.ndarray,
+        pointer: int,
+        accumulator: int,
+        debug_mode: bool,
+) -> tuple[bool, int, int]:
+    """
+    Execute the program until it halts and return the success, pointer, and accumulator.
+
+    In debug mode, the execution is stopped as soon as an instruction is about
+    to be executed for the second time, as that means we're in an infinite loop.
+
+    An `IndexError` is raised if the program jumps outside of its instructions.
+    """
+    visited = np.zeros(len(operations), dtype=np.bool_)
+    while pointer != len(operations):
+        if not 0 <= pointer < len(operations):
+            raise IndexError("instruction pointer out of range")
+
+        if debug_mode:
+            if visited[pointer]:
+                return False, pointer, accumulator
+            visited[pointer] = True
+
+        operation = operations[pointer]
+        if operation == ACC:
+            accumulator += arguments[pointer]
+            pointer += 1
+        elif operation == JMP:
+            pointer += arguments[pointer]
+        else:
+            pointer += 1
+
+    return True, pointer, accumulator
+
+
+@njit(cache=True)
+def execute_with_repair(
+        operations: np.ndarray,
+        arguments: np.ndarray,
+        halting: np.ndarray,
+        pointer: int,
+        accumulator: int,
+) -> int:
+    """
+    Execute the program, flipping the first `jmp` or `nop` that leads to a halting path.
+
+    The `halting` array indicates for each position, including the position
+    right after the last instruction, whether the program halts from there.
+
+    An `IndexError` is raised if the program jumps outside of its instructions.
+    """
+    repaired = False
+    while pointer != len(operations):
+        if not 0 <= pointer < len(operations):
+            raise IndexError("instruction pointer out of range")
+
+        operation = operations[pointer]
+        argument = arguments[pointer]
+        if not repaired and operation == JMP and halting[pointer + 1]:
+            pointer += 1
+            repaired = True
+        elif (
+            not repaired
+            and operation == NOP
+            and 0 <= pointer + argument < len(halting)
+            and halting[pointer + argument]
+        ):
+            pointer += argument
+            repaired = True
+        elif operation == ACC:
+            accumulator += argument
+            pointer += 1
+        elif operation == JMP:
+            pointer += argument
+        else:
+            pointer += 1
+
+    return accumulator
+
+
+warm_up(execute, np.zeros(0, np.int64), np.zeros(0, np.int64), 0, 0, True)
+warm_up(execute_with_repair, np.zeros(0, np.int64), np.zeros(0, np.int64), np.ones(1, bool), 0, 0)
+
+
 class Instruction(typing.NamedTuple):
     """A ConsoleApplication instruction."""
 
@@ -33,12 +128,32 @@ class ApplicationState(typing.NamedTuple):
 class ConsoleApplication:
     """A virtual handheld game console."""
 
-    def __init__(self, instructions: dict[int, Instruction]) -> None:
-        """Parse the instructions and load the application into memory."""
+    def __init__(
+            self,
+            instructions: dict[int, Instruction],
+            encoded_instructions: typing.Optional[tuple[np.ndarray, np.ndarray]] = None,
+    ) -> None:
+        """
+        Load the application into memory.
+
+        For the jit-compiled interpreter, the instructions are encoded as an
+        array of operation codes and an array of arguments. As these arrays are
+        never modified, a copy of an application passes its already encoded
+        instructions instead of encoding them again.
+        """
         self.instructions = dict(instructions)
         self.pointer = 0
         self.accumulator = 0
 
+        if encoded_instructions is None:
+            operations, arguments = zip(*self.instructions.values())
+            encoded_instructions = (
+                np.fromiter(map(OPERATION_CODES.get, operations), dtype=np.int64),
+                np.array(arguments, dtype=np.int64),
+            )
+
+        self.operations, self.arguments = encoded_instructions
+
     @classmethod
     def from_raw_instructions(
             cls: type[ConsoleApplication],
@@ -52,7 +167,7 @@ class ConsoleApplication:
 
     def copy(self) -> ConsoleApplication:
         """Create a copy of the application."""
-        return type(self)(self.instructions)
+        return type(self)(self.instructions, (self.operations, self.arguments))
 
     def run(self, debug_mode: bool = False) -> ApplicationState:
         """
@@ -61,40 +176,14 @@ class ConsoleApplication:
         If run in safe mode, the application returns whenever it detects it has
         entered an infinite loop by keeping track of the instructions it has
         executed previously.
-        """
-        if debug_mode:
-            seen = set()
-            while True:
-                if self.pointer in seen:
-                    return ApplicationState(success=False, value=self.accumulator)
-                if self.pointer == len(self.instructions):
-                    return ApplicationState(success=True, value=self.accumulator)
-
-                seen.add(self.pointer)
-                self.step()
-        else:
-            while True:
-                self.step()
-                if self.pointer == len(self.instructions):
-                    return ApplicationState(success=True, value=self.accumulator)
-
-    def step(self) -> None:
-        """Perform a single step in the application."""
-        operation, argument = self.instructions[self.pointer]
-        getattr(self, operation)(argument)
 
-    def acc(self, value: int) -> None:
-        """Add a `value` to the accumulator and increase the pointer by one."""
-        self.accumulator += value
-        self.pointer += 1
-
-    def jmp(self, steps: int) -> None:
-        """Execute a jump to another instruction relative to its own location."""
-        self.pointer += steps
-
-    def nop(self, _argument: int) -> None:
-        """Do not do anything at all except going to the next instruction."""
-        self.pointer += 1
+        The instructions are executed by a jit-compiled interpreter function.
+        """
+        success, pointer, accumulator = execute(
+            self.operations, self.arguments, self.pointer, self.accumulator, debug_mode
+        )
+        self.pointer, self.accumulator = int(pointer), int(accumulator)
+        return ApplicationState(success=bool(success), value=self.accumulator)
 
 
 def debugger(application: ConsoleApplication) -> int:
@@ -136,17 +225,18 @@ def debugger(application: ConsoleApplication) -> int:
 
     # 3. Run the application, checking for each `jmp` or `nop` instruction if
     # flipping it would result in the application hitting a target instruction.
-    debugged = False
-    while application.pointer != len(application.instructions):
-        operation, argument = application.instructions[application.pointer]
-        if not debugged and operation == "jmp" and application.pointer + 1 in targets:
-            application.pointer += 1
-            debugged = True
-        elif not debugged and operation == "nop" and application.pointer + argument in targets:
-            application.pointer += argument
-            debugged = True
-        else:
-            getattr(application, operation)(argument)
+    halting = np.zeros(len(application.instructions) + 1, dtype=np.bool_)
+    halting[list(targets)] = True
+    application.accumulator = int(
+        execute_with_repair(
+            application.operations,
+            application.arguments,
+            halting,
+            application.pointer,
+            application.accumulator,
+        )
+    )
+    application.pointer = len(application.instructions)
 
     # Return the final value of the accumulator
     return application.accumulator
@@ -1,10 +1,10 @@
 import collections
-import functools
 import itertools
 import logging
-import operator
 import typing
 
+import numpy as np
+
 from aoc.helpers import Puzzle
 
 __all__ = ["part_one", "part_two"]
@@ -48,11 +48,16 @@ class XMASStreamCipher:
             self.add(number)
             return
 
-        subtract = functools.partial(operator.sub, number)
-        if all(d not in self._buffer_set for d in map(subtract, self._buffer_set) if d != number):
-            raise ValidationError(number=number)
+        # The number is valid if it's the sum of two different numbers in the
+        # buffer, so we can stop looking as soon as we've found such a pair.
+        buffer_set = self._buffer_set
+        for term in buffer_set:
+            complement = number - term
+            if complement != term and complement in buffer_set:
+                self.add(number)
+                return
 
-        self.add(number)
+        raise ValidationError(number=number)
 
     def add(self, number: int) -> None:
         """Add a number to the current buffer, removing one if necessary."""
@@ -77,22 +82,26 @@ def part_one(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
 
 
 def part_two(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
-    """Return the solution for part two of this day."""
-    current_sequence = collections.deque()
-    current_sequence_sum = 0
-
-    for number in puzzle.intlines:
-        current_sequence_sum += number
-        current_sequence.append(number)
-
-        # If we're at or over the target value, we need to
-        # check the sum and shrink the sequence if needed.
-        while current_sequence_sum >= puzzle["answer_one"]:
-            if current_sequence_sum == puzzle["answer_one"]:
-                return min(current_sequence) + max(current_sequence)
-
-            # We're over the target sum, remove a number from the
-            # left side of the sequence.
-            current_sequence_sum -= current_sequence.popleft()
+    """
+    Return the solution for part two of this day.
+
+    The sum of a contiguous range of numbers is the difference between two
+    prefix sums. By keeping track of the prefix sums we've seen so far, we
+    can find a range that sums to the target in a single pass.
+    """
+    numbers = puzzle.intarray
+    prefix_sums = np.concatenate(([0], np.cumsum(numbers))).tolist()
+    target = puzzle["answer_one"]
+
+    seen = {}
+    for end, prefix_sum in enumerate(prefix_sums):
+        start = seen.get(prefix_sum - target)
+
+        # The range needs to contain at least two numbers.
+        if start is not None and end - start >= 2:
+            sequence = numbers[start:end]
+            return int(sequence.min() + sequence.max())
+
+        seen.setdefault(prefix_sum, end)
 
     raise RuntimeError("I expected to find a result by now!")
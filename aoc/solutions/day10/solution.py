@@ -1,24 +1,68 @@
-import collections
+import itertools
 import logging
+import math
 import typing
 
+import numpy as np
+
 from aoc.helpers import Puzzle
 
 
 __all__ = ["part_one", "part_two"]
 log = logging.getLogger(__name__)
 
+# The number of ways to traverse a run of n consecutive 1-jolt differences.
+# As any of the adapters inside the run can be skipped, as long as we never
+# skip three adapters in a row, these are the Tribonacci numbers. The list is
+# extended as needed by `run_arrangements`.
+RUN_ARRANGEMENTS = [1, 1, 2]
+
+
+def run_arrangements(length: int) -> int:
+    """Return the number of ways to traverse a run of `length` 1-jolt differences."""
+    while len(RUN_ARRANGEMENTS) <= length:
+        RUN_ARRANGEMENTS.append(sum(RUN_ARRANGEMENTS[-3:]))
+
+    return RUN_ARRANGEMENTS[length]
+
+
+def count_arrangements(differences: list[int]) -> int:
+    """
+    Count the arrangements of adapters with any joltage differences from 1 to 3.
+
+    Each adapter can be reached from any adapter with a joltage up to three
+    jolts lower, so the number of ways to reach it is the sum of the ways to
+    reach those adapters.
+    """
+    joltages = list(itertools.accumulate(differences, initial=0))
+    ways = {0: 1}
+    for joltage in joltages[1:]:
+        ways[joltage] = sum(ways.get(joltage - step, 0) for step in (1, 2, 3))
+
+    return ways[joltages[-1]]
+
 
 def part_one(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """Return the longest adapter path between the power source and my device."""
-    puzzle["adapters"] = [0] + sorted(puzzle.intlines)
-    c = collections.Counter(b - a for a, b in zip(puzzle["adapters"], puzzle["adapters"][1:]))
-    return c[1] * (c[3]+1)
+    differences = np.diff(np.sort(puzzle.intarray), prepend=0)
+    puzzle["differences"] = differences.tolist()
+    return int(np.count_nonzero(differences == 1) * (np.count_nonzero(differences == 3) + 1))
 
 
 def part_two(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
-    """Return the number of possible combinations of adapters I could use."""
-    connections = {puzzle["adapters"][0]: 1}
-    for adapter in puzzle["adapters"][1:]:
-        connections[adapter] = sum(connections.get(adapter-i, 0) for i in range(1, 4))
-    return connections.popitem()[1]
+    """
+    Return the number of possible combinations of adapters I could use.
+
+    If the joltage differences are either 1 or 3, as they are in the puzzle
+    inputs, we can't skip an adapter at a 3-jolt gap, which means that the
+    arrangements of each run of 1-jolt differences are independent of each
+    other. The total number of arrangements is then the product of the
+    arrangements per run. Inputs with 2-jolt differences fall back to the
+    general dynamic programming solution.
+    """
+    differences = puzzle["differences"]
+    if 2 in differences:
+        return count_arrangements(differences)
+
+    runs = (len(list(run)) for difference, run in itertools.groupby(differences) if difference == 1)
+    return math.prod(run_arrangements(length) for length in runs)
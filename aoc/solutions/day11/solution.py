@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-import functools
+import itertools
 import logging
 import typing
-from collections import Callable, Generator
+from collections.abc import Callable, Generator
+
+import numpy as np
 
 from aoc.helpers import Puzzle
+from aoc.helpers.jit import njit, warm_up
 
 
 __all__ = ["part_one", "part_two"]
@@ -15,37 +18,45 @@ log = logging.getLogger(__name__)
 # of seats we've already processed. THere's no use in looking at locations we've
 # not processed yet. Neighbor relationships "in the future" will be back filled
 # when we process the future neighbor.
-DIRECTIONS_TO_CHECK = (complex(-1, 0), complex(-1, -1), complex(0, -1), complex(1, -1))
+DIRECTIONS_TO_CHECK = ((-1, 0), (-1, -1), (0, -1), (1, -1))
+
+# Markers for the locations in the grid of seat numbers that are not seats
+WALL = -2
+FLOOR = -1
 
 # New types
-SeatStates = typing.NewType('SeatStates', dict[complex, bool])
-Neighbors = typing.NewType('Neighbors', dict[complex, list[complex]])
-BoundsCheck = typing.NewType("BoundsCheck", Callable[[complex], bool])
+SeatNumbers = typing.NewType("SeatNumbers", list[int])
+Neighbors = typing.NewType("Neighbors", list[list[int]])
 
 
-def adjacent_neighbors(seats: SeatStates, location: complex) -> Generator[complex, None, None]:
-    """Yield known adjacent neighbors for this location."""
-    for direction in DIRECTIONS_TO_CHECK:
-        if (neighbor := location + direction) in seats:
-            yield neighbor
+def visible_neighbors(seats: SeatNumbers, location: int, stride: int) -> Generator[int, None, None]:
+    """
+    Yield the seat numbers of the neighbors visible from the current location.
 
+    As the waiting room is surrounded by walls in the grid, we can keep walking
+    in a direction until we hit something that's not floor without checking
+    the bounds of the waiting room.
+    """
+    for dx, dy in DIRECTIONS_TO_CHECK:
+        offset = dy * stride + dx
+        neighbor_location = location + offset
+        while (neighbor := seats[neighbor_location]) == FLOOR:
+            neighbor_location += offset
 
-def visible_neighbors(
-        seats: SeatStates, location: complex, *, in_bounds: BoundsCheck
-) -> Generator[complex, None, None]:
-    """Yield neighbors visible from the current location."""
-    for direction in DIRECTIONS_TO_CHECK:
-        neighbor = location
-        while in_bounds(neighbor := neighbor + direction):
-            if neighbor in seats:
-                yield neighbor
-                break
+        if neighbor != WALL:
+            yield neighbor
 
 
-def parse_seats(grid: list[str], neighbor_generator: Callable) -> tuple[SeatStates, Neighbors]:
+def parse_seats(grid: list[str], neighbor_generator: Callable) -> Neighbors:
     """
     Parse the grid to find seats and register which neighbors they have.
 
+    Seats are numbered in the order we encounter them, which allows us to
+    store the neighbors of each seat in a list indexed by seat number. The
+    seat number at each location is stored in a flat grid with a row of walls
+    above the waiting room and a column of walls at the start of each row, as
+    that is all a neighbor generator looking up and sideways can run into.
+
     The passed `neighbor_generator` will be used to find the relevant neighbors
     for the current seat. The generator function should only check for neighbors
     in the direction of locations we've already processed (the three directions
@@ -56,58 +67,176 @@ def parse_seats(grid: list[str], neighbor_generator: Callable) -> tuple[SeatStat
     neighbours towards the bottom and right of the current location will be
     filled in once we reach them.
     """
-    seats = SeatStates({})
-    neighbors = Neighbors({})
+    stride = len(grid[0]) + 1
+    seats = SeatNumbers([WALL] * stride + [FLOOR] * (len(grid) * stride))
+    neighbors = Neighbors([])
 
-    for y, row in enumerate(grid):
-        for x, cell in enumerate(row):
+    for y, row in enumerate(grid, start=1):
+        seats[y * stride] = WALL
+        for x, cell in enumerate(row, start=1):
             if cell != "L":
                 continue
 
             # Initialize this seat location
-            location = complex(x, y)
-            seats[location] = False
-            neighbors[location] = []
+            seat = len(neighbors)
+            location = y * stride + x
+            seats[location] = seat
+            neighbors.append([])
 
             # Iterate over all the neighbors for this seat and add a
             # bidirectional relationship between the seats.
-            for neighbor in neighbor_generator(seats, location):
-                neighbors[neighbor].append(location)
-                neighbors[location].append(neighbor)
+            for neighbor in neighbor_generator(seats, location, stride):
+                neighbors[neighbor].append(seat)
+                neighbors[seat].append(neighbor)
+
+    return neighbors
+
+
+def seating_rules(neighbor_limit: int) -> np.ndarray:
+    """
+    Return a lookup table with the next state of a seat.
+
+    The table is indexed by the current state of the seat and its number of
+    occupied neighbors. An empty seat becomes occupied if it has no occupied
+    neighbors; an occupied seat stays occupied if it has fewer than
+    `neighbor_limit` occupied neighbors.
+    """
+    rules = np.zeros((2, 9), dtype=np.uint8)
+    rules[0, 0] = 1
+    rules[1, :neighbor_limit] = 1
+    return rules
 
-    return seats, neighbors
 
+@njit(cache=True)
+def seating_simulation(
+        state: np.ndarray, indptr: np.ndarray, indices: np.ndarray, rules: np.ndarray
+) -> int:
+    """
+    Return the number of occupied seats after finding a stable state.
+
+    The neighbors of seat `i` are stored in compressed sparse row format:
+    they are `indices[indptr[i]:indptr[i + 1]]`. The next state of a seat is
+    looked up in the `rules` table, see `seating_rules`.
 
-def seating_simulation(seats: SeatStates, neighbors: Neighbors, neighbor_limit: int) -> int:
-    """Return the number of occupied seats after finding a stable state."""
+    Instead of recounting the occupied neighbors of all seats every round,
+    we keep track of the counts and only update them for the neighbors of
+    seats that flipped. Only those seats, and the flipped seats themselves,
+    need to be reevaluated in the next round. Note that `state` is updated
+    in place.
+    """
+    seat_count = len(state)
+    occupied_neighbors = np.zeros(seat_count, dtype=np.int64)
+    for seat in range(seat_count):
+        if state[seat]:
+            for k in range(indptr[seat], indptr[seat + 1]):
+                occupied_neighbors[indices[k]] += 1
+
+    candidates = np.arange(seat_count)
+    candidate_count = seat_count
+    is_candidate = np.zeros(seat_count, dtype=np.bool_)
+    flipped = np.empty(seat_count, dtype=np.int64)
     while True:
-        # We need a copy to prevent using a partially updated state for
-        # all seats after seat 1.
-        old_seats = seats.copy()
-        for seat, taken in old_seats.items():
-            occupied_neighbors = sum(old_seats[n] for n in neighbors[seat])
-            seats[seat] = occupied_neighbors < neighbor_limit if taken else occupied_neighbors == 0
+        # Determine which seats flip before changing anything, so the next
+        # state is based on a consistent current state for all seats.
+        flip_count = 0
+        for c in range(candidate_count):
+            seat = candidates[c]
+            if rules[state[seat], occupied_neighbors[seat]] != state[seat]:
+                flipped[flip_count] = seat
+                flip_count += 1
+
+        # The situation has stabilized if no seat flipped.
+        if flip_count == 0:
+            return state.sum()
+
+        candidate_count = 0
+        for f in range(flip_count):
+            seat = flipped[f]
+            state[seat] ^= 1
+            delta = 1 if state[seat] else -1
+            for k in range(indptr[seat], indptr[seat + 1]):
+                neighbor = indices[k]
+                occupied_neighbors[neighbor] += delta
+                if not is_candidate[neighbor]:
+                    is_candidate[neighbor] = True
+                    candidates[candidate_count] = neighbor
+                    candidate_count += 1
+
+            if not is_candidate[seat]:
+                is_candidate[seat] = True
+                candidates[candidate_count] = seat
+                candidate_count += 1
+
+        for c in range(candidate_count):
+            is_candidate[candidates[c]] = False
+
+
+warm_up(
+    seating_simulation,
+    np.zeros(0, np.uint8), np.zeros(1, np.int64), np.zeros(0, np.int64), seating_rules(5),
+)
+
+
+def to_compressed_neighbors(neighbors: Neighbors) -> tuple[np.ndarray, np.ndarray]:
+    """Convert the neighbors to compressed sparse row arrays indexed by seat number."""
+    indptr = np.cumsum([0] + [len(seat_neighbors) for seat_neighbors in neighbors])
+    indices = np.fromiter(
+        itertools.chain.from_iterable(neighbors), dtype=np.int64, count=indptr[-1]
+    )
+    return indptr, indices
+
+
+def adjacent_seating_simulation(grid: list[str]) -> int:
+    """
+    Return the number of occupied seats after finding a stable state.
+
+    This simulation only looks at the eight adjacent locations of each seat,
+    which means that we can simulate all seats at once with bitwise operations
+    on a single integer. Each location gets a 4-bit lane in that integer, wide
+    enough to hold a count of up to eight neighbors without overflowing into
+    the next lane. An extra floor location at the end of each row prevents
+    neighbors from wrapping around to the other side of the room.
+
+    Shifting the occupied seats by the lane offset of each of the eight
+    directions and adding the results gives us the occupied neighbor count of
+    all locations at once.
+    """
+    row_length = len(grid[0]) + 1
+    lane_offsets = tuple(4 * offset for offset in (1, row_length - 1, row_length, row_length + 1))
+
+    # The lowest bit of the lane of each seat is set; the lanes are ordered
+    # from the least significant bits to the most significant bits.
+    locations = "".join(row + "." for row in grid)
+    seats = int("".join("0001" if cell == "L" else "0000" for cell in reversed(locations)), 2)
+    lanes = seats * 0b1111
+
+    occupied = 0
+    while True:
+        counts = 0
+        for offset in lane_offsets:
+            counts += (occupied >> offset) + (occupied << offset)
+        counts &= lanes
+
+        # Set the lowest bit of the lanes of seats with 0 and fewer than 4 neighbors.
+        no_neighbors = seats ^ (seats & (counts | counts >> 1 | counts >> 2 | counts >> 3))
+        few_neighbors = seats ^ (seats & (counts >> 2 | counts >> 3))
+        new = (no_neighbors & ~occupied) | (few_neighbors & occupied)
 
         # Check if the situation has stabilized.
-        if old_seats == seats:
-            return sum(seats.values())
+        if new == occupied:
+            return bin(occupied).count("1")
+
+        occupied = new
 
 
 def part_one(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """Return the number of occupied seats after the seating arrangements stabilizes."""
-    seats, neighbors = parse_seats(puzzle.lines, adjacent_neighbors)
-    return seating_simulation(seats, neighbors, neighbor_limit=4)
+    return adjacent_seating_simulation(puzzle.lines)
 
 
 def part_two(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """Return the number of occupied seats after the seating arrangements stabilizes."""
-    width = len(puzzle.lines[0])
-
-    def bounds_check(location: complex) -> bool:
-        """Check if this location is still within bounds of the waiting room."""
-        return 0 <= location.real < width and 0 <= location.imag
-
-    neighbor_generator = functools.partial(visible_neighbors, in_bounds=bounds_check)
-
-    seats, neighbors = parse_seats(puzzle.lines, neighbor_generator)
-    return seating_simulation(seats, neighbors, neighbor_limit=5)
+    neighbors = parse_seats(puzzle.lines, visible_neighbors)
+    indptr, indices = to_compressed_neighbors(neighbors)
+    state = np.zeros(len(neighbors), dtype=np.uint8)
+    return int(seating_simulation(state, indptr, indices, seating_rules(neighbor_limit=5)))
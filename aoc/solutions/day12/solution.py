@@ -1,126 +1,118 @@
-import dataclasses
-import enum
-import functools
 import logging
 import typing
-from collections import Generator
+
+import numpy as np
 
 from aoc.helpers import Puzzle
+from aoc.helpers.jit import njit, warm_up
 
-__all__ = ["part_one", "part_two"]
+__all__ = ["part_one", "part_two", "prepare_puzzle"]
 log = logging.getLogger(__name__)
 
 
-# Relate a human-readable cardinal direction to a heading on the
-# complex plane. Note that the x-axis (WEST-EAST) maps to the real
-# part of the complex coordinate and the x-axis (NORTH-SOUTH) maps
-# to the imaginary part of the complex coordinate.
-class CardinalDirection(enum.Enum):
-    NORTH = complex(0, 1)
-    SOUTH = complex(0, -1)
-    EAST = complex(1, 0)
-    WEST = complex(-1, 0)
-
+# The navigation actions, encoded by the ASCII value of their letter so we
+# can read them directly from the input bytes.
+ACTIONS = b"NSEWLRF"
+NORTH, SOUTH, EAST, WEST, LEFT, RIGHT, FORWARD = ACTIONS
 
-# Relate a human-readable rotation direction to a multiplication factor
-# to rotate around the origin of the complex plane.
-class Rotation(enum.Enum):
-    LEFT = complex(0, 1)
-    RIGHT = complex(0, -1)
 
-    def by_degrees(self, degrees: int) -> complex:
-        """Calculate the total rotation factor based on the specified degrees."""
-        rotation_factor = degrees // 90
-        return self.value ** rotation_factor
+# The cosine and sine of counterclockwise rotations by 0, 90, 180, and 270
+# degrees, used to rotate a heading by a number of quarter turns.
+COSINES = (1, 0, -1, 0)
+SINES = (0, 1, 0, -1)
 
 
-@dataclasses.dataclass
-class Ferry:
+@njit(cache=True)
+def navigate(
+        actions: np.ndarray,
+        values: np.ndarray,
+        heading_x: int,
+        heading_y: int,
+        use_waypoint: bool,
+) -> int:
     """
-    A ferry used to travel to remove, tropical islands.
+    Navigate the ferry and return the Manhattan distance from its starting point.
 
-    This ferry can operate in two distinct navigation modes:
-    1. The ferry can navigate using a waypoint relative to the ferry's location;
-    2. The ferry can navigate without using a waypoint.
+    The ferry moves forward towards its heading. If the ferry is using a
+    waypoint, the heading is the location of the waypoint relative to the
+    ferry and the cardinal actions move the waypoint instead of the ferry.
 
-    The waypoint functionality can be enabled by passing the initial location
-    of the waypoint relative to the ferry in the constructor call.
+    Consecutive rotations are combined and only applied to the heading right
+    before the heading is used or changed by another action.
     """
-
-    location: complex = complex(0, 0)
-    heading: complex = complex(1, 0)
-    waypoint: typing.Optional[complex] = None
-
-    def cardinal_move(self, distance: int, *, direction: CardinalDirection) -> None:
-        """
-        Move the ferry or the waypoint in the specified Cardinal direction.
-
-        If the ferry is using a waypoint, this function will move the waypoint
-        in the specified direction. If the ferry is operating without a waypoint,
-        the ferry itself will be moved in the specified direction; it's heading
-        will remain the same.
-        """
-        if self.waypoint is None:
-            self.location += distance * direction.value
+    x, y = 0, 0
+    quarter_turns = 0
+    for action, value in zip(actions, values):
+        if action == LEFT:
+            quarter_turns += value // 90
+            continue
+
+        if action == RIGHT:
+            quarter_turns -= value // 90
+            continue
+
+        if action == FORWARD or use_waypoint:
+            quarter_turns %= 4
+            if quarter_turns:
+                cosine, sine = COSINES[quarter_turns], SINES[quarter_turns]
+                heading_x, heading_y = (
+                    heading_x * cosine - heading_y * sine,
+                    heading_x * sine + heading_y * cosine,
+                )
+                quarter_turns = 0
+
+        if action == FORWARD:
+            x += heading_x * value
+            y += heading_y * value
+            continue
+
+        dx, dy = 0, 0
+        if action == NORTH:
+            dy = value
+        elif action == SOUTH:
+            dy = -value
+        elif action == EAST:
+            dx = value
         else:
-            self.waypoint += distance * direction.value
-
-    def rotate(self, degrees: int, *, rotation: Rotation) -> None:
-        """
-        Rotate the ferry or the waypoint the specified degrees left or right.
-
-        If the ferry is using a waypoint to navigate, the waypoint will be
-        rotated around the ship by the specified degrees. If the ferry is
-        currently operating without a waypoint, the ferry itself will be
-        rotated.
-        """
-        if self.waypoint is None:
-            self.heading *= rotation.by_degrees(degrees)
-        else:
-            self.waypoint *= rotation.by_degrees(degrees)
+            dx = -value
 
-    def forward(self, distance: int) -> None:
-        """Move the ferry forward using the current heading or waypoint location."""
-        if self.waypoint is None:
-            self.location += self.heading * distance
+        if use_waypoint:
+            heading_x += dx
+            heading_y += dy
         else:
-            self.location += self.waypoint * distance
+            x += dx
+            y += dy
+
+    return abs(x) + abs(y)
+
 
-    # Define partialmethods and method aliases we need to relate instructions
-    # directly to the Ferry methods that need to be executed for them.
-    N = functools.partialmethod(cardinal_move, direction=CardinalDirection.NORTH)
-    S = functools.partialmethod(cardinal_move, direction=CardinalDirection.SOUTH)
-    E = functools.partialmethod(cardinal_move, direction=CardinalDirection.EAST)
-    W = functools.partialmethod(cardinal_move, direction=CardinalDirection.WEST)
-    L = functools.partialmethod(rotate, rotation=Rotation.LEFT)
-    R = functools.partialmethod(rotate, rotation=Rotation.RIGHT)
-    F = forward
+warm_up(navigate, np.zeros(0, np.uint8), np.zeros(0, np.int64), 1, 0, False)
 
-    @property
-    def distance_from_origin(self) -> int:
-        """Return the Manhattan distance from the ferry's original location."""
-        return int(abs(self.location.real) + abs(self.location.imag))
 
+def parse_instructions(raw_instructions: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse the instructions into an array of actions and an array of values.
+
+    As the action letters are the only non-digit, non-whitespace characters in
+    the input, we can select them directly from the raw bytes. Deleting them
+    leaves one value per line, which NumPy parses in a single call.
+    """
+    raw_array = np.frombuffer(raw_instructions, dtype=np.uint8)
+    actions = raw_array[raw_array >= ord("A")]
+    values = np.fromstring(raw_instructions.translate(None, ACTIONS), dtype=np.int64, sep="\n")
+    return actions, values
 
-def instructions(raw_instructions: list[str]) -> Generator[tuple[str, int], None, None]:
-    """Yield the next instruction for our ferry."""
-    for line in raw_instructions:
-        yield line[0], int(line[1:])
+
+def prepare_puzzle(puzzle: Puzzle) -> None:
+    """Parse the instructions for today's puzzle."""
+    puzzle["actions"], puzzle["values"] = parse_instructions(puzzle.input_bytes)
 
 
 def part_one(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """Move the ferry using the provided instructions."""
-    ferry = Ferry()
-    for instruction, units in instructions(puzzle.lines):
-        getattr(ferry, instruction)(int(units))
-
-    return ferry.distance_from_origin
+    return int(navigate(puzzle["actions"], puzzle["values"], 1, 0, False))
 
 
 def part_two(puzzle: Puzzle) -> typing.Optional[typing.Union[str, int]]:
     """Move the ferry using the provided instructions and its waypoint."""
-    ferry = Ferry(waypoint=complex(10, 1))
-    for instruction, units in instructions(puzzle.lines):
-        getattr(ferry, instruction)(int(units))
-
-    return ferry.distance_from_origin
+    return int(navigate(puzzle["actions"], puzzle["values"], 10, 1, True))